@@ -1,24 +1,43 @@
 # api/main.py
 import os
+import random
 import sqlite3
 import sys
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from pathlib import Path
+from uuid import uuid4
 
-import pandas as pd
 from dotenv import load_dotenv
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.responses import JSONResponse
 from loguru import logger
 from prometheus_client import Histogram
 from prometheus_fastapi_instrumentator import Instrumentator
 from pydantic import BaseModel, ConfigDict
 
+from api.shadow import ShadowScorer
+
 load_dotenv()
 TEST_MODE = os.getenv("TEST_MODE") == "1" or bool(os.getenv("PYTEST_CURRENT_TEST"))
 MLFLOW_TRACKING_URI = os.getenv("MLFLOW_TRACKING_URI")
 MODEL_NAME = os.getenv("MODEL_NAME")
 MODEL_ALIAS = "Production"
+# Optional challenger loaded alongside Production. CANARY_FRACTION of requests
+# are served by it; SHADOW_SAMPLE_RATE of requests have the non-serving model
+# scored in the background for comparison. Shadow scoring runs in a subprocess
+# when more than one CPU is available (SHADOW_USE_PROCESS=auto), otherwise on
+# a background thread; set SHADOW_USE_PROCESS=1/0 to force either.
+CHALLENGER_ALIAS = os.getenv("CHALLENGER_ALIAS") or None
+CANARY_FRACTION = float(os.getenv("CANARY_FRACTION", "0"))
+SHADOW_SAMPLE_RATE = float(os.getenv("SHADOW_SAMPLE_RATE", "0.05"))
+SHADOW_USE_PROCESS = os.getenv("SHADOW_USE_PROCESS", "auto")
+NEIGHBOR_INDEX_PATH = Path(
+    os.getenv(
+        "NEIGHBOR_INDEX_PATH",
+        Path(__file__).parent.parent / "data" / "processed" / "neighbor_index.joblib",
+    )
+)
 
 logger.remove()
 logger.add(
@@ -42,7 +61,139 @@ DB_PATH = (
     else Path(__file__).parent.parent / "monitoring" / "predictions.db"
 )
 
+# Heavy dependencies (pandas, mlflow) are imported lazily inside the model
+# loaders below, so importing this module and serving /health stays cheap.
+_model = None
+_challenger = None
+_shadow_scorer = None
+_neighbor_index = None
+
+
+class _DummyModel:
+    version = "dummy"
+
+    def predict(self, records: list[dict]) -> list[float]:
+        return [float(r["MedInc"]) for r in records]
+
+
+class _PyfuncModel:
+    """Adapts an MLflow pyfunc model to the list-of-records interface."""
+
+    def __init__(self, pyfunc_model, version: str):
+        self._model = pyfunc_model
+        self.version = version
+
+    def predict(self, records: list[dict]):
+        import pandas as pd
+
+        return self._model.predict(pd.DataFrame(records))
+
+
+def load_model(alias: str = MODEL_ALIAS):
+    """Load the dummy model in tests, the MLflow model behind `alias` otherwise."""
+    if TEST_MODE:
+        logger.info("Loaded dummy model (TEST_MODE=1).")
+        return _DummyModel()
+
+    import mlflow
+    from mlflow.tracking import MlflowClient
+
+    mlflow.set_tracking_uri(MLFLOW_TRACKING_URI)
+    logger.info(f"Attempting to load model '{MODEL_NAME}' with alias '{alias}'...")
+    try:
+        client = MlflowClient()
+        latest = client.get_model_version_by_alias(name=MODEL_NAME, alias=alias)
+        model_uri = f"models:/{MODEL_NAME}/{latest.version}"
+        model = mlflow.pyfunc.load_model(model_uri)
+        logger.info(f"Loaded model version {latest.version} from {model_uri}.")
+    except Exception as e:
+        logger.exception("Failed to load model from MLflow.")
+        raise RuntimeError(f"Could not load model: {e}") from e
+    return _PyfuncModel(model, str(latest.version))
+
+
+def get_model():
+    global _model
+    if _model is None:
+        _model = load_model()
+    return _model
+
+
+def get_challenger():
+    """The challenger model, or None when shadow/canary evaluation is off."""
+    global _challenger, CHALLENGER_ALIAS
+    if _challenger is None and CHALLENGER_ALIAS:
+        try:
+            _challenger = load_model(CHALLENGER_ALIAS)
+        except RuntimeError:
+            # A missing challenger must never take down the primary model
+            logger.warning(
+                f"Challenger '{CHALLENGER_ALIAS}' unavailable; serving primary only."
+            )
+            CHALLENGER_ALIAS = None
+    return _challenger
+
+
+def _shadow_use_process() -> bool:
+    if SHADOW_USE_PROCESS != "auto":
+        return SHADOW_USE_PROCESS == "1"
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    return cpus > 1
+
+
+def get_shadow_scorer():
+    global _shadow_scorer
+    if _shadow_scorer is None:
+        challenger = get_challenger()
+        if challenger is None:
+            return None
+        primary = get_model()
+        _shadow_scorer = ShadowScorer(
+            models={"primary": primary, "challenger": challenger},
+            versions={"primary": primary.version, "challenger": challenger.version},
+            db_path=DB_PATH,
+            use_process=_shadow_use_process(),
+        )
+    return _shadow_scorer
+
+
+def get_neighbor_index():
+    """Memory-map the prebuilt neighbour index; None if it has not been built."""
+    global _neighbor_index
+    if _neighbor_index is None:
+        if not NEIGHBOR_INDEX_PATH.exists():
+            return None
+        from src.data.neighbor_index import NeighborIndex
+
+        _neighbor_index = NeighborIndex.load(NEIGHBOR_INDEX_PATH)
+        logger.info(
+            f"Loaded neighbour index ({len(_neighbor_index)} rows) "
+            f"from {NEIGHBOR_INDEX_PATH}."
+        )
+    return _neighbor_index
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Outside tests, load the model before accepting traffic so a bad
+    # registry state still fails the replica at startup.
+    if not TEST_MODE:
+        get_model()
+        if get_neighbor_index() is None:
+            logger.warning(
+                f"No neighbour index at {NEIGHBOR_INDEX_PATH}; /neighbors disabled."
+            )
+        get_shadow_scorer()
+    yield
+    if _shadow_scorer is not None:
+        _shadow_scorer.shutdown()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="California House Price Prediction API",
     description="API for predicting house prices using the California Housing dataset.",
     version="1.0.0",
@@ -63,36 +214,11 @@ async def global_exception_handler(request: Request, exc: Exception):
 
 Instrumentator().instrument(app).expose(app)
 PREDICTION_HISTOGRAM = Histogram(
-    "predicted_house_value", "Distribution of predicted house values ($100k)"
+    "predicted_house_value",
+    "Distribution of predicted house values ($100k)",
+    ["model_role"],
 )
 
-# Model: dummy in tests, MLflow in normal runs
-if TEST_MODE:
-
-    class _DummyModel:
-        def predict(self, df: pd.DataFrame):
-            return [float(df["MedInc"].iat[0])]
-
-    model = _DummyModel()
-    logger.info("Loaded dummy model (TEST_MODE=1).")
-else:
-    import mlflow
-    from mlflow.tracking import MlflowClient
-
-    mlflow.set_tracking_uri(MLFLOW_TRACKING_URI)
-    logger.info(
-        f"Attempting to load model '{MODEL_NAME}' with alias '{MODEL_ALIAS}'..."
-    )
-    try:
-        client = MlflowClient()
-        latest = client.get_model_version_by_alias(name=MODEL_NAME, alias=MODEL_ALIAS)
-        model_uri = f"models:/{MODEL_NAME}/{latest.version}"
-        model = mlflow.pyfunc.load_model(model_uri)
-        logger.info(f"Loaded model version {latest.version} from {model_uri}.")
-    except Exception as e:
-        logger.exception("Failed to load model from MLflow.")
-        raise RuntimeError(f"Could not load model: {e}") from e
-
 
 def log_prediction_to_db(features: dict, predicted_value: float):
     """Log input and prediction to SQLite if enabled."""
@@ -167,8 +293,35 @@ def health_check():
 @app.post("/predict")
 def predict(features: HouseFeatures):
     feature_dict = features.model_dump()
-    input_df = pd.DataFrame([feature_dict])
-    predicted_value = float(model.predict(input_df)[0])
-    PREDICTION_HISTOGRAM.observe(predicted_value)
+    challenger = get_challenger()
+    if challenger is not None and random.random() < CANARY_FRACTION:
+        role, model = "challenger", challenger
+    else:
+        role, model = "primary", get_model()
+    predicted_value = float(model.predict([feature_dict])[0])
+    PREDICTION_HISTOGRAM.labels(model_role=role).observe(predicted_value)
     log_prediction_to_db(feature_dict, predicted_value)
+    # Record which model served every request; the other model is scored
+    # later, off the request path, for the sampled fraction only
+    scorer = get_shadow_scorer()
+    if scorer is not None:
+        shadow = random.random() < SHADOW_SAMPLE_RATE
+        scorer.submit(uuid4().hex, feature_dict, role, predicted_value, shadow)
     return {"predicted_median_house_value": predicted_value}
+
+
+@app.post("/neighbors")
+def neighbors(features: HouseFeatures, k: int = Query(5, ge=1, le=50)):
+    index = get_neighbor_index()
+    if index is None:
+        raise HTTPException(status_code=503, detail="Neighbour index not available.")
+    feature_dict = features.model_dump()
+    try:
+        return {
+            "geographic": index.query_geographic(
+                feature_dict["Latitude"], feature_dict["Longitude"], k=k
+            ),
+            "feature_space": index.query_features(feature_dict, k=k),
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
@@ -0,0 +1,214 @@
+# api/shadow.py
+import multiprocessing
+import os
+import queue
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+
+from loguru import logger
+from prometheus_client import Counter
+
+from monitoring.setup_db import CREATE_MODEL_PREDICTIONS_TABLE
+
+SHADOW_DROPPED = Counter(
+    "shadow_predictions_dropped_total",
+    "Shadow scoring requests dropped because the queue was full",
+)
+
+# Models held by the scoring subprocess, set once by its initializer
+_worker_models = None
+
+
+def _init_worker(models: dict):
+    global _worker_models
+    _worker_models = models
+
+
+def _predict_in_worker(role: str, records: list) -> list:
+    return [float(p) for p in _worker_models[role].predict(records)]
+
+
+class ShadowScorer:
+    """Scores the non-serving model off the request path.
+
+    Every request enqueues (request_id, features, served role, served value,
+    shadow) and returns immediately. A single worker thread drains the queue
+    in batches and writes the served output to ``model_predictions``; for
+    items with ``shadow=True`` it also runs the other model(s), one
+    ``predict`` per model per batch, so outputs can be compared by
+    request_id. When the queue is full, items are dropped rather than
+    blocking the caller. Batches are large and infrequent (by default up to
+    1024 items or every 5 s), so the worker rarely competes with request
+    handlers for the CPU or the GIL.
+
+    With ``use_process=True`` the predictions run in a single spawned
+    subprocess holding its own copy of the models instead of on the worker
+    thread. If that subprocess cannot be started, dies, or does not answer
+    within ``predict_timeout`` seconds, it is terminated and scoring falls
+    back to the worker thread.
+    """
+
+    def __init__(
+        self,
+        models: dict,
+        versions: dict,
+        db_path=None,
+        batch_size: int = 1024,
+        flush_interval: float = 5.0,
+        max_queue: int = 10_000,
+        use_process: bool = False,
+        predict_timeout: float = 30.0,
+    ):
+        self.models = models
+        self.versions = versions
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.predict_timeout = predict_timeout
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stopping = threading.Event()
+        self._executor = None
+        if use_process:
+            try:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=1,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(models,),
+                )
+                # Spawn the subprocess and load the models now, before traffic
+                self._executor.submit(len, ()).result(timeout=predict_timeout)
+            except Exception as e:
+                self._fall_back_to_thread(e)
+        self._worker = threading.Thread(
+            target=self._run, name="shadow-scorer", daemon=True
+        )
+        if self.db_path is not None:
+            self._execute(CREATE_MODEL_PREDICTIONS_TABLE)
+        self._worker.start()
+
+    def submit(
+        self,
+        request_id: str,
+        features: dict,
+        served_role: str,
+        served_value: float,
+        shadow: bool = True,
+    ):
+        item = (request_id, features, served_role, served_value, shadow)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            SHADOW_DROPPED.inc()
+
+    def shutdown(self, timeout: float = 5.0):
+        """Flush whatever is queued and stop the worker, within `timeout` seconds."""
+        self._stopping.set()
+        self._worker.join(timeout)
+        self._stop_executor()
+
+    def _run(self):
+        # Only run when the CPU is otherwise idle (Linux), so scoring does not
+        # steal time from request handlers on small hosts
+        try:
+            os.sched_setscheduler(
+                threading.get_native_id(), os.SCHED_IDLE, os.sched_param(0)
+            )
+        except (AttributeError, OSError):
+            pass
+        # Wake on a timer rather than per item, so requests never hand the
+        # GIL to this thread just by enqueuing
+        while not self._stopping.is_set():
+            self._stopping.wait(self.flush_interval)
+            self._drain()
+
+    def _drain(self):
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                return
+            try:
+                self._score(batch)
+            except Exception:
+                logger.exception("Shadow scoring failed for a batch.")
+
+    def _score(self, batch: list):
+        now = datetime.now(timezone.utc).isoformat()
+        rows = []
+        for role in self.models:
+            # Score this model on every sampled request it did not serve
+            pending = [item for item in batch if item[4] and item[2] != role]
+            if not pending:
+                continue
+            preds = self._predict(role, [item[1] for item in pending])
+            for (request_id, *_), pred in zip(pending, preds):
+                rows.append(
+                    (now, request_id, role, self.versions[role], 0, float(pred))
+                )
+        for request_id, _, served_role, served_value, _ in batch:
+            rows.append(
+                (
+                    now,
+                    request_id,
+                    served_role,
+                    self.versions[served_role],
+                    1,
+                    served_value,
+                )
+            )
+        if self.db_path is not None:
+            self._execute(
+                """
+                INSERT INTO model_predictions
+                (timestamp, request_id, model_role, model_version, served, predicted_value)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+
+    def _predict(self, role: str, records: list) -> list:
+        if self._executor is not None:
+            try:
+                future = self._executor.submit(_predict_in_worker, role, records)
+                return future.result(timeout=self.predict_timeout)
+            except (BrokenProcessPool, FutureTimeoutError) as e:
+                self._fall_back_to_thread(e)
+        return self.models[role].predict(records)
+
+    def _fall_back_to_thread(self, error: Exception):
+        logger.warning(f"Shadow scoring subprocess unavailable ({error!r}); in-thread.")
+        self._stop_executor()
+
+    def _stop_executor(self):
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        # A hung subprocess would block a waiting shutdown, so kill it
+        processes = list((executor._processes or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    def _execute(self, sql: str, rows=None):
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_path)
+            if rows is None:
+                conn.execute(sql)
+            else:
+                conn.executemany(sql, rows)
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to write model predictions. Error: {e}")
+        finally:
+            if conn:
+                conn.close()
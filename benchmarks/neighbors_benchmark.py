@@ -0,0 +1,97 @@
+# benchmarks/neighbors_benchmark.py
+"""Measure per-query latency of the prebuilt nearest-neighbour index.
+
+Uses data/processed/neighbor_index.joblib when it exists (run `dvc repro`
+first); otherwise builds a synthetic index of the same size in a temp dir.
+
+    python benchmarks/neighbors_benchmark.py --queries 2000 --k 5
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from src.data.neighbor_index import NeighborIndex, build_neighbor_index  # noqa: E402
+
+INDEX_PATH = ROOT / "data" / "processed" / "neighbor_index.joblib"
+FEATURES = [
+    "MedInc",
+    "HouseAge",
+    "AveRooms",
+    "AveBedrms",
+    "Population",
+    "AveOccup",
+    "Latitude",
+    "Longitude",
+]
+
+
+def _synthetic_index(rows: int, out_dir: Path) -> Path:
+    rng = np.random.default_rng(0)
+    raw = pd.DataFrame(rng.uniform(1, 10, (rows, len(FEATURES))), columns=FEATURES)
+    raw["Latitude"] = rng.uniform(32.5, 42.0, rows)
+    raw["Longitude"] = rng.uniform(-124.3, -114.3, rows)
+    scaler = StandardScaler().fit(raw)
+    train = pd.DataFrame(scaler.transform(raw), columns=FEATURES)
+    train["MedHouseVal"] = rng.uniform(0.5, 5, rows)
+    train.to_parquet(out_dir / "train.parquet", index=False)
+    return build_neighbor_index(
+        out_dir / "train.parquet", scaler, out_dir / "neighbor_index.joblib"
+    )
+
+
+def _report(name: str, seconds: list[float]):
+    us = np.asarray(seconds) * 1e6
+    print(
+        f"{name:<16} p50 {np.percentile(us, 50):8.1f} us  "
+        f"p99 {np.percentile(us, 99):8.1f} us  max {us.max():8.1f} us"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--rows", type=int, default=16000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if INDEX_PATH.exists():
+            path = INDEX_PATH
+        else:
+            path = _synthetic_index(args.rows, Path(tmp))
+        t0 = time.perf_counter()
+        index = NeighborIndex.load(path)
+        print(f"Loaded {len(index)} rows in {(time.perf_counter() - t0) * 1e3:.1f} ms")
+
+        rng = np.random.default_rng(1)
+        geo, feat = [], []
+        for _ in range(args.queries):
+            features = dict(zip(FEATURES, rng.uniform(1, 10, len(FEATURES))))
+            features["Latitude"] = rng.uniform(32.5, 42.0)
+            features["Longitude"] = rng.uniform(-124.3, -114.3)
+
+            t0 = time.perf_counter()
+            index.query_geographic(features["Latitude"], features["Longitude"], args.k)
+            geo.append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            index.query_features(features, args.k)
+            feat.append(time.perf_counter() - t0)
+
+        _report("geographic", geo)
+        _report("feature_space", feat)
+
+
+if __name__ == "__main__":
+    main()
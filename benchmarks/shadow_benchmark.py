@@ -0,0 +1,163 @@
+# benchmarks/shadow_benchmark.py
+"""Check that shadow scoring does not regress /predict latency.
+
+Both models are real scikit-learn regressors fitted on synthetic data, so the
+shadow worker does genuine CPU work while requests are being served. Shadow
+scoring uses the API's own defaults (SHADOW_SAMPLE_RATE, SHADOW_USE_PROCESS)
+unless overridden, and logs to a temporary SQLite database.
+
+The ``predict`` handler is timed in-process rather than over HTTP: the
+transport is identical with and without shadow scoring and only adds noise.
+Rounds are longer than the scorer's flush interval so its batches land
+inside the timed windows.
+
+The primary-only baseline is run twice per round; the gap between those two
+runs is the run-to-run noise. A percentile passes when the shadowed latency
+is within max(--max-rel-delta * baseline, noise) of the baseline. The script
+exits non-zero otherwise.
+
+    python benchmarks/shadow_benchmark.py --rounds 8
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ["TEST_MODE"] = "1"
+
+import numpy as np  # noqa: E402
+from sklearn.ensemble import RandomForestRegressor  # noqa: E402
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+import api.main  # noqa: E402
+from monitoring.setup_db import DB_PATH  # noqa: E402
+
+FEATURES = [
+    "MedInc",
+    "HouseAge",
+    "AveRooms",
+    "AveBedrms",
+    "Population",
+    "AveOccup",
+    "Latitude",
+    "Longitude",
+]
+
+
+class _SklearnModel:
+    def __init__(self, estimator, version: str):
+        self.estimator = estimator
+        self.version = version
+
+    def predict(self, records):
+        X = np.array([[r[c] for c in FEATURES] for r in records])
+        return self.estimator.predict(X)
+
+
+def _fit(n_estimators: int, seed: int) -> RandomForestRegressor:
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(2000, len(FEATURES)))
+    y = X[:, 0] * 2 + rng.normal(size=2000)
+    return RandomForestRegressor(n_estimators=n_estimators, random_state=seed).fit(X, y)
+
+
+def _run(requests: list) -> np.ndarray:
+    timings = []
+    for features in requests:
+        t0 = time.perf_counter()
+        api.main.predict(features)
+        timings.append(time.perf_counter() - t0)
+    return np.asarray(timings) * 1e3
+
+
+def _report(name: str, ms: np.ndarray):
+    print(
+        f"{name:<16} p50 {np.percentile(ms, 50):6.3f} ms  "
+        f"p99 {np.percentile(ms, 99):6.3f} ms  mean {ms.mean():6.3f} ms"
+    )
+
+
+def _configure(shadow: bool, primary, challenger):
+    """Serve `primary`, with `challenger` shadow-scored via the API's defaults."""
+    if api.main._shadow_scorer is not None:
+        api.main._shadow_scorer.shutdown(timeout=60)
+    api.main._model = primary
+    api.main._challenger = challenger if shadow else None
+    api.main._shadow_scorer = None
+    api.main.CHALLENGER_ALIAS = None
+    api.main.CANARY_FRACTION = 0.0
+    if shadow:
+        api.main.get_shadow_scorer()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=8)
+    parser.add_argument("--per-round", type=int, default=1500)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--max-rel-delta", type=float, default=0.05)
+    parser.add_argument("--sample-rate", type=float, default=None)
+    parser.add_argument("--use-process", choices=["auto", "1", "0"], default=None)
+    args = parser.parse_args()
+
+    if args.sample_rate is not None:
+        api.main.SHADOW_SAMPLE_RATE = args.sample_rate
+    if args.use_process is not None:
+        api.main.SHADOW_USE_PROCESS = args.use_process
+    print(
+        f"SHADOW_SAMPLE_RATE={api.main.SHADOW_SAMPLE_RATE} "
+        f"use_process={api.main._shadow_use_process()} "
+        f"cpus={len(os.sched_getaffinity(0))}"
+    )
+
+    primary = _SklearnModel(_fit(20, 0), "1")
+    challenger = _SklearnModel(_fit(50, 1), "2")
+    rng = np.random.default_rng(2)
+    requests = [
+        api.main.HouseFeatures(
+            **dict(zip(FEATURES, map(float, rng.normal(size=len(FEATURES)))))
+        )
+        for _ in range(args.per_round)
+    ]
+    runs = {"baseline": [], "baseline again": [], "shadow": []}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        api.main.DB_PATH = Path(tmp) / DB_PATH.name
+        # Alternate the runs in rounds so machine drift hits all of them equally
+        for _ in range(args.rounds):
+            for name, timings in runs.items():
+                _configure(name == "shadow", primary, challenger)
+                _run(requests[: args.warmup])
+                timings.append(_run(requests))
+        _configure(False, primary, challenger)
+
+    first = np.concatenate(runs["baseline"])
+    second = np.concatenate(runs["baseline again"])
+    baseline = np.concatenate([first, second])
+    shadowed = np.concatenate(runs["shadow"])
+    _report("primary only", baseline)
+    _report("primary + shadow", shadowed)
+
+    failed = False
+    for q in (50, 99):
+        base = np.percentile(baseline, q)
+        noise = abs(np.percentile(first, q) - np.percentile(second, q))
+        limit = max(args.max_rel_delta * base, noise)
+        delta = np.percentile(shadowed, q) - base
+        ok = delta <= limit
+        failed |= not ok
+        print(
+            f"  p{q} delta: {delta:+.3f} ms ({delta / base:+.1%}), "
+            f"limit {limit:.3f} ms (noise {noise:.3f} ms) {'ok' if ok else 'FAIL'}"
+        )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
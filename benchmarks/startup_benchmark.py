@@ -0,0 +1,84 @@
+# benchmarks/startup_benchmark.py
+"""Measure cold import time of the API and pipeline modules.
+
+Each module is imported in a fresh interpreter (so nothing is cached in
+sys.modules) and the wall time of the import is reported, together with any
+heavy dependencies that ended up loaded.
+
+    TEST_MODE=1 python benchmarks/startup_benchmark.py --repeat 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+MODULES = [
+    "api.main",
+    "src.models.train_multiple_models",
+    "src.models.train_baseline",
+    "src.models.register_best_model",
+    "src.retraining.retrain_pipeline",
+]
+HEAVY_MODULES = ["pandas", "numpy", "mlflow", "sklearn", "scipy"]
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t0
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+
+def measure(module: str, repeat: int) -> dict:
+    """Import `module` `repeat` times in fresh interpreters; return timings."""
+    env = {**os.environ, "TEST_MODE": os.getenv("TEST_MODE", "1")}
+    timings, heavy = [], []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            return {"module": module, "error": proc.stderr.strip().splitlines()[-1]}
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        timings.append(result["seconds"])
+        heavy = result["heavy"]
+    return {
+        "module": module,
+        "median_ms": round(statistics.median(timings) * 1000, 1),
+        "min_ms": round(min(timings) * 1000, 1),
+        "heavy_imports": heavy,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        result = measure(module, args.repeat)
+        if "error" in result:
+            print(f"{module:<40} ERROR: {result['error']}")
+            continue
+        heavy = ", ".join(result["heavy_imports"]) or "-"
+        print(
+            f"{module:<40} median {result['median_ms']:>8.1f} ms  "
+            f"min {result['min_ms']:>8.1f} ms  heavy: {heavy}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,20 @@ from pathlib import Path
 # Define the path for the database in the monitoring directory
 DB_PATH = Path(__file__).parent / "predictions.db"
 
+# One row per (request, model) when a challenger is shadowed/canaried;
+# `served` marks the output that was returned to the client.
+CREATE_MODEL_PREDICTIONS_TABLE = """
+    CREATE TABLE IF NOT EXISTS model_predictions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME NOT NULL,
+        request_id TEXT NOT NULL,
+        model_role TEXT NOT NULL,
+        model_version TEXT NOT NULL,
+        served INTEGER NOT NULL,
+        predicted_value REAL NOT NULL
+    );
+"""
+
 
 def create_database():
     """Creates the SQLite database and the predictions table if they don't exist."""
@@ -32,9 +46,11 @@ def create_database():
                              """
 
         cursor.execute(create_table_query)
+
+        cursor.execute(CREATE_MODEL_PREDICTIONS_TABLE)
         conn.commit()
         print(f"Database created successfully at '{DB_PATH}'")
-        print("`predictions` table is ready.")
+        print("`predictions` and `model_predictions` tables are ready.")
 
     except sqlite3.Error as e:
         print(f"Database error: {e}")
@@ -0,0 +1,132 @@
+# src/data/neighbor_index.py
+"""Prebuilt nearest-neighbour index over the processed training rows.
+
+Two trees are built once at preprocessing time from ``train.parquet``:
+
+* a haversine ``BallTree`` on (Latitude, Longitude) in radians, and
+* a ``KDTree`` on the scaled feature columns.
+
+Both are dumped together with the scaler statistics (needed to map a raw
+request into the scaled space) and loaded with ``mmap_mode="r"`` so the tree
+arrays are memory-mapped rather than copied into every API worker.
+"""
+
+import math
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import BallTree, KDTree
+
+TARGET_COL = "MedHouseVal"
+EARTH_RADIUS_KM = 6371.0
+
+
+def build_neighbor_index(train_path, scaler, output_path) -> Path:
+    """Build both trees from the processed train split and dump them to disk.
+
+    Args:
+        train_path: Path to ``train.parquet`` (scaled features + target).
+        scaler: The fitted ``StandardScaler`` returned by ``preprocess``.
+        output_path: Where to write the joblib bundle.
+    """
+    train_df = pd.read_parquet(train_path)
+    feature_cols = [c for c in train_df.columns if c != TARGET_COL]
+    scaled = train_df[feature_cols].to_numpy(dtype=np.float64)
+
+    mean = np.asarray(scaler.mean_, dtype=np.float64)
+    scale = np.asarray(scaler.scale_, dtype=np.float64)
+    lat_idx = feature_cols.index("Latitude")
+    lon_idx = feature_cols.index("Longitude")
+    # The processed split only holds scaled values; undo the scaling to get
+    # the original coordinates back for the geographic tree.
+    coords = np.column_stack(
+        [
+            scaled[:, lat_idx] * scale[lat_idx] + mean[lat_idx],
+            scaled[:, lon_idx] * scale[lon_idx] + mean[lon_idx],
+        ]
+    )
+
+    bundle = {
+        "feature_cols": feature_cols,
+        "mean": mean,
+        "scale": scale,
+        "coords": coords,
+        "target": train_df[TARGET_COL].to_numpy(dtype=np.float64),
+        "geo_tree": BallTree(np.radians(coords), metric="haversine"),
+        "feature_tree": KDTree(scaled),
+    }
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump(bundle, output_path)
+    print(f"✅ Neighbour index ({len(train_df)} rows) saved to: {output_path}")
+    return output_path
+
+
+class NeighborIndex:
+    """Read-only view over a bundle written by ``build_neighbor_index``."""
+
+    def __init__(self, bundle: dict):
+        self.feature_cols = bundle["feature_cols"]
+        self._mean = bundle["mean"]
+        self._scale = bundle["scale"]
+        self._coords = bundle["coords"]
+        self._target = bundle["target"]
+        self._geo_tree = bundle["geo_tree"]
+        self._feature_tree = bundle["feature_tree"]
+
+    @classmethod
+    def load(cls, path) -> "NeighborIndex":
+        return cls(joblib.load(path, mmap_mode="r"))
+
+    def __len__(self) -> int:
+        return len(self._target)
+
+    def scale_features(self, features: dict) -> np.ndarray:
+        """Apply the preprocessing transform (log1p Population + scaling).
+
+        Raises:
+            ValueError: If Population is outside the domain of log1p (<= -1).
+        """
+        if features["Population"] <= -1:
+            raise ValueError("Population must be greater than -1.")
+        raw = [
+            math.log1p(features[c]) if c == "Population" else features[c]
+            for c in self.feature_cols
+        ]
+        return (np.asarray(raw, dtype=np.float64) - self._mean) / self._scale
+
+    def _rows(self, dist, ind, distance_factor: float = 1.0) -> list[dict]:
+        return [
+            {
+                "index": int(i),
+                "Latitude": float(self._coords[i, 0]),
+                "Longitude": float(self._coords[i, 1]),
+                TARGET_COL: float(self._target[i]),
+                "distance": float(d) * distance_factor,
+            }
+            for d, i in zip(dist[0], ind[0])
+        ]
+
+    def query_geographic(self, latitude: float, longitude: float, k: int = 5):
+        """k nearest training rows by great-circle distance (``distance`` in km).
+
+        Raises:
+            ValueError: If the coordinates are not valid degrees (also NaN/inf).
+        """
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValueError(
+                "Latitude must be in [-90, 90] and Longitude in [-180, 180]."
+            )
+        k = min(k, len(self))
+        dist, ind = self._geo_tree.query(np.radians([[latitude, longitude]]), k=k)
+        return self._rows(dist, ind, EARTH_RADIUS_KM)
+
+    def query_features(self, features: dict, k: int = 5):
+        """k nearest training rows by Euclidean distance in scaled feature space."""
+        k = min(k, len(self))
+        dist, ind = self._feature_tree.query(
+            self.scale_features(features).reshape(1, -1), k=k
+        )
+        return self._rows(dist, ind)
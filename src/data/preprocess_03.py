@@ -12,7 +12,7 @@ def load_raw_data(path: str) -> pd.DataFrame:
     return pd.read_csv(path)
 
 
-def preprocess(df: pd.DataFrame) -> pd.DataFrame:
+def preprocess(df: pd.DataFrame, return_scaler: bool = False):
     df = df.copy()
     california_housing_schema.validate(df)  # Pandera validate
 
@@ -39,6 +39,9 @@ def preprocess(df: pd.DataFrame) -> pd.DataFrame:
     df_processed = pd.concat(
         [features_scaled_df, target.reset_index(drop=True)], axis=1
     )
+    if return_scaler:
+        # The neighbour index needs the scaler to map raw requests into this space
+        return df_processed, scaler
     return df_processed
 
 
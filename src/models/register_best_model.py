@@ -1,61 +1,94 @@
-# src/models/register_and_promote.py ...
+# src/models/register_best_model.py
 
+import argparse
 import os
 import warnings
-from pathlib import Path
 
-import mlflow
 from dotenv import load_dotenv
-from mlflow.tracking import MlflowClient
-
-# Suppress future warnings from MLflow for a cleaner output
-warnings.filterwarnings("ignore", category=FutureWarning)
-
-# --- 1. SETUP ---
-# Load environment variables from .env file
-load_dotenv()
-
-# Configure MLflow to connect to your tracking server
-mlflow.set_tracking_uri(os.environ["MLFLOW_TRACKING_URI"])
-client = MlflowClient()
-model_name = os.environ["MODEL_NAME"]
-
-print(f"🔄 Starting process for model: {model_name}")
-
-# --- 2. FIND THE BEST RUN ---
-# Get the 'default' experiment and search for the top-performing run
-experiment = client.get_experiment_by_name("default")
-runs = client.search_runs(
-    experiment_ids=[experiment.experiment_id],
-    order_by=["metrics.custom_rmse ASC", "metrics.custom_r2_score DESC"],
-    max_results=1,
-)
-
-if not runs:
-    raise Exception("❌ No runs found to register.")
-
-best_run = runs[0]
-print(f"🏆 Found best run: {best_run.data.tags.get('mlflow.runName')}")
-print(
-    f"📉 RMSE: {best_run.data.metrics['custom_rmse']:.4f}, 📈 R²: {best_run.data.metrics['custom_r2_score']:.4f}"
-)
-
-# --- 3. REGISTER THE MODEL ---
-# Create the model URI from the best run's ID
-model_uri = f"runs:/{best_run.info.run_id}/model"
-
-# Register the model and wait for the registration to complete
-registered_version = mlflow.register_model(
-    model_uri=model_uri,
-    name=model_name,
-    await_registration_for=300,  # Wait up to 5 minutes
-)
-print(f"✅ Registered model '{model_name}' with version {registered_version.version}")
-
-# --- 4. PROMOTE THE NEWLY REGISTERED MODEL ---
-# Set the "Production" alias for the version we just registered
-client.set_registered_model_alias(
-    name=model_name, alias="Production", version=registered_version.version
-)
-print(f"🚀 Promoted version {registered_version.version} to 'Production' alias.")
-print("✨ Process complete.")
+
+PRODUCTION_ALIAS = "Production"
+
+
+def find_best_run(client, experiment_name: str = "default"):
+    """Return the top run by custom_rmse (tie-break custom_r2_score)."""
+    experiment = client.get_experiment_by_name(experiment_name)
+    runs = client.search_runs(
+        experiment_ids=[experiment.experiment_id],
+        order_by=["metrics.custom_rmse ASC", "metrics.custom_r2_score DESC"],
+        max_results=1,
+    )
+
+    if not runs:
+        raise Exception("❌ No runs found to register.")
+
+    best_run = runs[0]
+    print(f"🏆 Found best run: {best_run.data.tags.get('mlflow.runName')}")
+    print(
+        f"📉 RMSE: {best_run.data.metrics['custom_rmse']:.4f}, 📈 R²: {best_run.data.metrics['custom_r2_score']:.4f}"
+    )
+    return best_run
+
+
+def register_run(run, model_name: str):
+    """Register the run's logged model and wait for registration to complete."""
+    import mlflow
+
+    # Create the model URI from the best run's ID
+    model_uri = f"runs:/{run.info.run_id}/model"
+    registered_version = mlflow.register_model(
+        model_uri=model_uri,
+        name=model_name,
+        await_registration_for=300,  # Wait up to 5 minutes
+    )
+    print(
+        f"✅ Registered model '{model_name}' with version {registered_version.version}"
+    )
+    return registered_version
+
+
+def promote(client, model_name: str, version, alias: str = PRODUCTION_ALIAS):
+    """Point `alias` at the given model version."""
+    client.set_registered_model_alias(name=model_name, alias=alias, version=version)
+    print(f"🚀 Promoted version {version} to '{alias}' alias.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Register and promote the best run.")
+    parser.add_argument(
+        "--alias",
+        default=PRODUCTION_ALIAS,
+        help="Alias to set on the new version, e.g. 'Challenger' to shadow/canary "
+        "it in the API (CHALLENGER_ALIAS) before it takes 'Production'.",
+    )
+    args = parser.parse_args(argv)
+
+    import mlflow
+    from mlflow.tracking import MlflowClient
+
+    # Suppress future warnings from MLflow for a cleaner output
+    warnings.filterwarnings("ignore", category=FutureWarning)
+
+    # --- 1. SETUP ---
+    # Load environment variables from .env file
+    load_dotenv()
+
+    # Configure MLflow to connect to your tracking server
+    mlflow.set_tracking_uri(os.environ["MLFLOW_TRACKING_URI"])
+    client = MlflowClient()
+    model_name = os.environ["MODEL_NAME"]
+
+    print(f"🔄 Starting process for model: {model_name}")
+
+    # --- 2. FIND THE BEST RUN ---
+    best_run = find_best_run(client)
+
+    # --- 3. REGISTER THE MODEL ---
+    registered_version = register_run(best_run, model_name)
+
+    # --- 4. PROMOTE THE NEWLY REGISTERED MODEL ---
+    promote(client, model_name, registered_version.version, alias=args.alias)
+    print("✨ Process complete.")
+
+
+if __name__ == "__main__":
+    main()
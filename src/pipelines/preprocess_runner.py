@@ -9,6 +9,7 @@ if str(ROOT) not in sys.path:
     sys.path.append(str(ROOT))
 # --- End of path modification ---
 
+from src.data.neighbor_index import build_neighbor_index
 from src.data.preprocess_03 import load_raw_data, preprocess, split_and_save
 
 
@@ -21,10 +22,15 @@ def main():
     df = load_raw_data(raw_data_path)
 
     print("Preprocessing data...")
-    df_clean = preprocess(df)
+    df_clean, scaler = preprocess(df, return_scaler=True)
 
     print(f"Saving processed data to: {output_dir}")
     split_and_save(df_clean, output_dir)
+
+    print("Building nearest-neighbour index...")
+    build_neighbor_index(
+        f"{output_dir}/train.parquet", scaler, f"{output_dir}/neighbor_index.joblib"
+    )
     print("✅ Preprocessing complete.")
 
 
@@ -1,10 +1,12 @@
 # src/retraining/drift.py
-import pandas as pd
-from scipy.stats import ks_2samp
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def detect_drift(
-    reference_data_path: str, new_data: pd.DataFrame, p_value_threshold: float = 0.05
+    reference_data_path: str, new_data: "pd.DataFrame", p_value_threshold: float = 0.05
 ):
     """
     Detects data drift between reference data and new data using the K-S test.
@@ -17,6 +19,10 @@ def detect_drift(
     Returns:
         dict: A report of drifted features and overall drift status.
     """
+    # pandas/scipy are only needed when a drift check actually runs
+    import pandas as pd
+    from scipy.stats import ks_2samp
+
     try:
         reference_df = pd.read_parquet(reference_data_path)
         # We only need the features for comparison, not the target variable
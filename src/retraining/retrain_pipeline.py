@@ -1,13 +1,15 @@
 import subprocess
 import sys
-from pathlib import Path  # <-- New import
-
-import pandas as pd
-from drift import detect_drift
+from pathlib import Path
 
 # --- CONFIGURATION ---
 # Define the project root to create robust, absolute paths
 ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from src.retraining.drift import detect_drift  # noqa: E402
+
 REFERENCE_DATA_PATH = ROOT / "data/processed/train.parquet"
 RAW_DATA_PATH = ROOT / "data/raw/california_housing.csv"
 NEW_DATA_SAMPLE_SIZE = 5000
@@ -17,6 +19,8 @@ def run_retraining_pipeline():
     """
     Orchestrates the drift detection and retraining process.
     """
+    import pandas as pd
+
     print("🚀 Starting retraining pipeline...")
 
     # --- 1. SIMULATE NEW DATA ---
@@ -82,5 +86,9 @@ def run_retraining_pipeline():
         sys.exit(1)
 
 
-if __name__ == "__main__":
+def main():
     run_retraining_pipeline()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import os
+
+os.environ["TEST_MODE"] = "1"  # bypass MLflow in CI
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import api.main
+from src.data.neighbor_index import NeighborIndex, build_neighbor_index
+from src.data.preprocess_03 import preprocess
+
+client = TestClient(api.main.app)
+
+PAYLOAD = {
+    "MedInc": 8.3,
+    "HouseAge": 41.0,
+    "AveRooms": 6.98,
+    "AveBedrms": 1.02,
+    "Population": 322.0,
+    "AveOccup": 2.55,
+    "Latitude": 37.88,
+    "Longitude": -122.23,
+}
+
+
+@pytest.fixture(scope="module")
+def index_path(tmp_path_factory):
+    rng = np.random.default_rng(0)
+    n = 500
+    raw = pd.DataFrame(
+        {
+            "MedInc": rng.uniform(1, 10, n),
+            "HouseAge": rng.uniform(1, 50, n),
+            "AveRooms": rng.uniform(2, 10, n),
+            "AveBedrms": rng.uniform(0.8, 2, n),
+            "Population": rng.uniform(100, 3000, n),
+            "AveOccup": rng.uniform(1, 5, n),
+            "Latitude": rng.uniform(32.5, 42.0, n),
+            "Longitude": rng.uniform(-124.3, -114.3, n),
+            "MedHouseVal": rng.uniform(0.5, 5, n),
+        }
+    )
+    raw.loc[0, ["Latitude", "Longitude"]] = [37.88, -122.23]
+    processed, scaler = preprocess(raw, return_scaler=True)
+    out = tmp_path_factory.mktemp("processed")
+    processed.to_parquet(out / "train.parquet", index=False)
+    return build_neighbor_index(
+        out / "train.parquet", scaler, out / "neighbor_index.joblib"
+    )
+
+
+def test_geographic_neighbors_match_brute_force(index_path):
+    index = NeighborIndex.load(index_path)
+    result = index.query_geographic(37.88, -122.23, k=5)
+
+    assert len(result) == 5
+    assert result[0]["Latitude"] == pytest.approx(37.88)
+    assert result[0]["Longitude"] == pytest.approx(-122.23)
+    assert result[0]["distance"] == pytest.approx(0.0, abs=1e-6)
+
+    lat, lon = np.radians(index._coords).T
+    q_lat, q_lon = np.radians([37.88, -122.23])
+    d_lat = np.sin((lat - q_lat) / 2) ** 2
+    d_lon = np.cos(q_lat) * np.cos(lat) * np.sin((lon - q_lon) / 2) ** 2
+    hav = d_lat + d_lon
+    brute = np.sort(2 * 6371.0 * np.arcsin(np.sqrt(hav)))[:5]
+    assert [r["distance"] for r in result] == pytest.approx(brute, abs=1e-6)
+
+
+def test_feature_neighbors_use_preprocessing_transform(index_path):
+    index = NeighborIndex.load(index_path)
+    train = pd.read_parquet(index_path.parent / "train.parquet")
+    row = train.iloc[7]
+    # Undo log1p + scaling to get the raw feature values back
+    raw = dict(zip(index.feature_cols, row[index.feature_cols].to_numpy()))
+    raw = {
+        c: v * index._scale[i] + index._mean[i] for i, (c, v) in enumerate(raw.items())
+    }
+    raw["Population"] = np.expm1(raw["Population"])
+
+    nearest = index.query_features(raw, k=1)[0]
+    assert nearest["index"] == 7
+    assert nearest["MedHouseVal"] == pytest.approx(row["MedHouseVal"])
+
+
+def test_neighbors_endpoint(index_path, monkeypatch):
+    monkeypatch.setattr(api.main, "NEIGHBOR_INDEX_PATH", index_path)
+    monkeypatch.setattr(api.main, "_neighbor_index", None)
+
+    r = client.post("/neighbors?k=3", json=PAYLOAD)
+    assert r.status_code == 200
+    body = r.json()
+    assert len(body["geographic"]) == 3
+    assert len(body["feature_space"]) == 3
+    assert {"Latitude", "Longitude", "MedHouseVal", "distance"} <= set(
+        body["geographic"][0]
+    )
+
+
+def test_neighbors_endpoint_rejects_population_out_of_domain(index_path, monkeypatch):
+    monkeypatch.setattr(api.main, "NEIGHBOR_INDEX_PATH", index_path)
+    monkeypatch.setattr(api.main, "_neighbor_index", None)
+
+    r = client.post("/neighbors", json={**PAYLOAD, "Population": -1.0})
+    assert r.status_code == 422
+    assert "Population" in r.json()["detail"]
+
+
+@pytest.mark.parametrize(
+    "coords", [{"Latitude": 200.0}, {"Latitude": -90.5}, {"Longitude": 181.0}]
+)
+def test_neighbors_endpoint_rejects_invalid_coordinates(
+    index_path, monkeypatch, coords
+):
+    monkeypatch.setattr(api.main, "NEIGHBOR_INDEX_PATH", index_path)
+    monkeypatch.setattr(api.main, "_neighbor_index", None)
+
+    r = client.post("/neighbors", json={**PAYLOAD, **coords})
+    assert r.status_code == 422
+    assert "Latitude" in r.json()["detail"]
+
+
+def test_query_geographic_rejects_nan(index_path):
+    index = NeighborIndex.load(index_path)
+    with pytest.raises(ValueError):
+        index.query_geographic(float("nan"), -122.23)
+
+
+def test_neighbors_endpoint_without_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(api.main, "NEIGHBOR_INDEX_PATH", tmp_path / "missing.joblib")
+    monkeypatch.setattr(api.main, "_neighbor_index", None)
+
+    r = client.post("/neighbors", json=PAYLOAD)
+    assert r.status_code == 503
@@ -0,0 +1,227 @@
+import os
+
+os.environ["TEST_MODE"] = "1"  # bypass MLflow in CI
+
+import multiprocessing
+import sqlite3
+import time
+
+from fastapi.testclient import TestClient
+
+import api.main
+from api.shadow import SHADOW_DROPPED, ShadowScorer
+
+client = TestClient(api.main.app)
+
+PAYLOAD = {
+    "MedInc": 8.3,
+    "HouseAge": 41.0,
+    "AveRooms": 6.98,
+    "AveBedrms": 1.02,
+    "Population": 322.0,
+    "AveOccup": 2.55,
+    "Latitude": 37.88,
+    "Longitude": -122.23,
+}
+
+
+class _ConstantModel:
+    def __init__(self, value: float, version: str):
+        self.value = value
+        self.version = version
+        self.batch_sizes = []
+
+    def predict(self, records):
+        self.batch_sizes.append(len(records))
+        return [self.value] * len(records)
+
+
+class _HangsInSubprocessModel:
+    """Predicts MedInc, but never returns when run in the scoring subprocess."""
+
+    def predict(self, records):
+        if multiprocessing.parent_process() is not None:
+            time.sleep(600)
+        return [r["MedInc"] for r in records]
+
+
+def _rows(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(
+            "SELECT request_id, model_role, model_version, served, predicted_value "
+            "FROM model_predictions ORDER BY request_id, model_role"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def test_shadow_scorer_batches_and_logs_both_models(tmp_path):
+    primary = _ConstantModel(1.0, "1")
+    challenger = _ConstantModel(2.0, "2")
+    db_path = tmp_path / "predictions.db"
+    scorer = ShadowScorer(
+        models={"primary": primary, "challenger": challenger},
+        versions={"primary": "1", "challenger": "2"},
+        db_path=db_path,
+        batch_size=10,
+    )
+    for i in range(10):
+        scorer.submit(f"r{i}", PAYLOAD, "primary", 1.0)
+    scorer.shutdown()
+
+    assert primary.batch_sizes == []  # served values are not recomputed
+    assert challenger.batch_sizes == [10]
+    rows = _rows(db_path)
+    assert len(rows) == 20
+    assert ("r0", "challenger", "2", 0, 2.0) in rows
+    assert ("r0", "primary", "1", 1, 1.0) in rows
+
+
+def test_shadow_scorer_drops_when_queue_full(monkeypatch):
+    # Keep the worker from draining the queue so the test is timing-independent
+    monkeypatch.setattr(ShadowScorer, "_run", lambda self: None)
+    scorer = ShadowScorer(
+        models={"primary": _ConstantModel(1.0, "1")},
+        versions={"primary": "1"},
+        max_queue=1,
+    )
+    scorer.submit("r0", PAYLOAD, "primary", 1.0)
+    before = SHADOW_DROPPED._value.get()
+    scorer.submit("r1", PAYLOAD, "primary", 1.0)
+    assert SHADOW_DROPPED._value.get() == before + 1
+
+
+def test_unsampled_requests_still_record_served_model(tmp_path):
+    challenger = _ConstantModel(2.0, "2")
+    db_path = tmp_path / "predictions.db"
+    scorer = ShadowScorer(
+        models={"primary": _ConstantModel(1.0, "1"), "challenger": challenger},
+        versions={"primary": "1", "challenger": "2"},
+        db_path=db_path,
+    )
+    scorer.submit("r0", PAYLOAD, "challenger", 2.0, shadow=False)
+    scorer.shutdown()
+
+    assert _rows(db_path) == [("r0", "challenger", "2", 1, 2.0)]
+
+
+def test_predict_routes_canary_traffic_and_shadows(tmp_path, monkeypatch):
+    primary = _ConstantModel(1.0, "1")
+    challenger = _ConstantModel(2.0, "2")
+    scorer = ShadowScorer(
+        models={"primary": primary, "challenger": challenger},
+        versions={"primary": "1", "challenger": "2"},
+        db_path=tmp_path / "predictions.db",
+    )
+    monkeypatch.setattr(api.main, "_model", primary)
+    monkeypatch.setattr(api.main, "_challenger", challenger)
+    monkeypatch.setattr(api.main, "_shadow_scorer", scorer)
+    monkeypatch.setattr(api.main, "SHADOW_SAMPLE_RATE", 1.0)
+
+    monkeypatch.setattr(api.main, "CANARY_FRACTION", 1.0)
+    r = client.post("/predict", json=PAYLOAD)
+    assert r.json() == {"predicted_median_house_value": 2.0}
+
+    monkeypatch.setattr(api.main, "CANARY_FRACTION", 0.0)
+    r = client.post("/predict", json=PAYLOAD)
+    assert r.json() == {"predicted_median_house_value": 1.0}
+
+    # Not sampled for shadow scoring: the serving model is still recorded
+    monkeypatch.setattr(api.main, "CANARY_FRACTION", 1.0)
+    monkeypatch.setattr(api.main, "SHADOW_SAMPLE_RATE", 0.0)
+    r = client.post("/predict", json=PAYLOAD)
+    assert r.json() == {"predicted_median_house_value": 2.0}
+
+    scorer.shutdown()
+    rows = _rows(tmp_path / "predictions.db")
+    served = sorted((role, value) for _, role, _, s, value in rows if s)
+    shadow = sorted((role, value) for _, role, _, s, value in rows if not s)
+    assert served == [("challenger", 2.0), ("challenger", 2.0), ("primary", 1.0)]
+    assert shadow == [("challenger", 2.0), ("primary", 1.0)]
+
+
+def test_predict_without_challenger_skips_shadow(monkeypatch):
+    monkeypatch.setattr(api.main, "CHALLENGER_ALIAS", None)
+    monkeypatch.setattr(api.main, "_challenger", None)
+    monkeypatch.setattr(api.main, "_shadow_scorer", None)
+
+    r = client.post("/predict", json=PAYLOAD)
+    assert r.status_code == 200
+    assert api.main.get_shadow_scorer() is None
+
+
+def test_shadow_scorer_in_subprocess(tmp_path):
+    db_path = tmp_path / "predictions.db"
+    scorer = ShadowScorer(
+        models={
+            "primary": api.main._DummyModel(),
+            "challenger": api.main._DummyModel(),
+        },
+        versions={"primary": "1", "challenger": "2"},
+        db_path=db_path,
+        use_process=True,
+    )
+    assert scorer._executor is not None
+    scorer.submit("r0", PAYLOAD, "primary", 1.0)
+    scorer.shutdown(timeout=60)
+
+    assert ("r0", "challenger", "2", 0, PAYLOAD["MedInc"]) in _rows(db_path)
+
+
+def test_shadow_scorer_falls_back_when_subprocess_dies(tmp_path):
+    db_path = tmp_path / "predictions.db"
+    scorer = ShadowScorer(
+        models={
+            "primary": api.main._DummyModel(),
+            "challenger": api.main._DummyModel(),
+        },
+        versions={"primary": "1", "challenger": "2"},
+        db_path=db_path,
+        use_process=True,
+    )
+    for process in list(scorer._executor._processes.values()):
+        process.kill()
+        process.join()
+    scorer.submit("r0", PAYLOAD, "primary", 1.0)
+    scorer.submit("r1", PAYLOAD, "primary", 1.0)
+    scorer.shutdown(timeout=60)
+
+    assert scorer._executor is None
+    rows = _rows(db_path)
+    assert ("r0", "challenger", "2", 0, PAYLOAD["MedInc"]) in rows
+    assert ("r1", "challenger", "2", 0, PAYLOAD["MedInc"]) in rows
+
+
+def test_shadow_scorer_falls_back_when_subprocess_hangs(tmp_path):
+    db_path = tmp_path / "predictions.db"
+    scorer = ShadowScorer(
+        models={
+            "primary": _HangsInSubprocessModel(),
+            "challenger": _HangsInSubprocessModel(),
+        },
+        versions={"primary": "1", "challenger": "2"},
+        db_path=db_path,
+        use_process=True,
+        predict_timeout=1.0,
+    )
+    assert scorer._executor is not None
+    scorer.submit("r0", PAYLOAD, "primary", 1.0)
+    scorer.shutdown(timeout=60)
+
+    assert scorer._executor is None
+    assert ("r0", "challenger", "2", 0, PAYLOAD["MedInc"]) in _rows(db_path)
+
+
+def test_shutdown_is_bounded_when_queue_is_full(monkeypatch):
+    monkeypatch.setattr(ShadowScorer, "_run", lambda self: None)
+    scorer = ShadowScorer(
+        models={"primary": _ConstantModel(1.0, "1")},
+        versions={"primary": "1"},
+        max_queue=1,
+    )
+    scorer.submit("r0", PAYLOAD, "primary", 1.0)
+
+    start = time.monotonic()
+    scorer.shutdown(timeout=0.2)
+    assert time.monotonic() - start < 2.0
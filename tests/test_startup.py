@@ -0,0 +1,63 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+HEAVY = ["pandas", "mlflow", "sklearn", "scipy"]
+
+
+def _loaded_after(code: str) -> list:
+    """Run `code` in a fresh interpreter and report which HEAVY modules it loaded."""
+    probe = (
+        f"{code}\nimport json, sys\n"
+        f"print(json.dumps([m for m in {HEAVY!r} if m in sys.modules]))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=ROOT,
+        env={**os.environ, "TEST_MODE": "1"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def test_api_health_does_not_import_heavy_modules():
+    loaded = _loaded_after(
+        "from fastapi.testclient import TestClient\n"
+        "from api.main import app\n"
+        "assert TestClient(app).get('/health').status_code == 200"
+    )
+    assert "pandas" not in loaded
+    assert "mlflow" not in loaded
+
+
+def test_api_predict_in_test_mode_does_not_import_heavy_modules():
+    loaded = _loaded_after(
+        "from fastapi.testclient import TestClient\n"
+        "from api.main import app\n"
+        "r = TestClient(app).post('/predict', json=dict.fromkeys("
+        "['MedInc','HouseAge','AveRooms','AveBedrms','Population','AveOccup',"
+        "'Latitude','Longitude'], 1.0))\n"
+        "assert r.status_code == 200"
+    )
+    assert "pandas" not in loaded
+    assert "mlflow" not in loaded
+
+
+def test_pipeline_scripts_import_without_side_effects():
+    loaded = _loaded_after(
+        "import src.models.train_multiple_models as a\n"
+        "import src.models.train_baseline as b\n"
+        "import src.models.register_best_model as c\n"
+        "import src.retraining.retrain_pipeline as d\n"
+        "assert all(callable(m.main) for m in (a, b, c, d))"
+    )
+    assert "mlflow" not in loaded
+    assert "sklearn" not in loaded
+    assert "pandas" not in loaded
+    assert "scipy" not in loaded